@@ -1,34 +1,398 @@
 import json
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.stats import zscore
 from datetime import datetime, timedelta
 import os
 import sys
-from collections import Counter
-from report_generator import ReportGenerator
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property, partial
 import io
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba é opcional: sem ele os kernels abaixo rodam como Python puro
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Versão do formato do cache .npz; incrementar ao mudar as colunas extraídas
+_CACHE_VERSION = 2
+
+
+def _pyplot():
+    """Importa o matplotlib sob demanda: só é necessário para gerar os gráficos"""
+    import matplotlib
+    matplotlib.use('Agg')  # sem backend gráfico: os gráficos só são salvos em memória
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _ms_to_datetime(ms):
+    """Converte milissegundos desde a época em datetime"""
+    return _EPOCH + timedelta(milliseconds=int(ms))
+
+
+def _mean_std(values):
+    """Média e desvio padrão populacional, reaproveitando a média no cálculo do desvio"""
+    mean = values.mean()
+    deviations = values - mean
+    return mean, np.sqrt((deviations * deviations).mean())
+
+
+def _zscore_outliers(values, threshold):
+    """Conta os valores cujo Z-score (desvio padrão populacional) passa do limite em módulo"""
+    mean, std = _mean_std(values)
+    if not std:
+        # Sem variação não há outliers (o Z-score seria indefinido)
+        return 0
+    return int(np.count_nonzero(np.abs(values - mean) / std > threshold))
+
+
+# Classes de tecla usadas pelo kernel de segmentação
+_KC_TEXT = 0      # tecla com representação visível
+_KC_MODIFIER = 1  # Ctrl/Cmd
+_KC_COPY = 2      # 'c'
+_KC_PASTE = 3     # 'v'
+_KC_CUT = 4       # 'x'
+_KC_HIDDEN = 5    # tecla sem representação visível (shift, alt, ...)
+_KC_NONE = 6      # evento sem tecla registrada
+
+_CTRL_KEYS = frozenset({'Key.ctrl', 'Key.ctrl_l', 'Key.ctrl_r', 'Key.cmd', 'Key.cmd_l', 'Key.cmd_r'})
+_CMD_KEY_CLASSES = {'c': _KC_COPY, 'v': _KC_PASTE, 'x': _KC_CUT}
+_COMMAND_NAMES = {_KC_COPY: 'copy', _KC_PASTE: 'paste', _KC_CUT: 'cut'}
+
+# Comandos suspeitos; o código de cada um é sua posição + 1 (0 = nenhum comando)
+_SUSPICIOUS_COMMANDS = ("paste", "copy", "cut", "backspace", "cursor_movement")
+_CMD_CODES = {name: code for code, name in enumerate(_SUSPICIOUS_COMMANDS, 1)}
+
+# Representação das teclas especiais (sem o prefixo 'Key.')
+_SPECIAL_KEYS = {
+    'space': ' ',
+    'enter': '  ↵  ',
+    'tab': '  →|  ',
+    'backspace': '  |←  ',
+    'delete': '  del  ',
+    'up': '  ↑  ',
+    'down': '  ↓  ',
+    'left': '  ←  ',
+    'right': '  →  ',
+    'shift': '',
+    'shift_r': '',
+    'shift_l': '',
+    'ctrl': '',
+    'ctrl_l': '',
+    'ctrl_r': '',
+    'alt': '',
+    'alt_l': '',
+    'alt_r': '',
+    'cmd': '',
+    'cmd_l': '',
+    'cmd_r': ''
+}
+
+# Tabela pré-calculada: tecla bruta -> (classe, texto exibido)
+_KEY_TABLE = {'Key.' + key: (_KC_TEXT if text else _KC_HIDDEN, text) for key, text in _SPECIAL_KEYS.items()}
+_KEY_TABLE.update({key: (_KC_MODIFIER, '') for key in _CTRL_KEYS})
+_KEY_TABLE.update({char: (_KC_TEXT, f'[{char}]') for char in 'CVX'})
+_KEY_TABLE.update({char: (key_class, f'[{char.upper()}]') for char, key_class in _CMD_KEY_CLASSES.items()})
+
+
+def _key_entry(key):
+    """Retorna (classe, texto exibido) de uma tecla, memorizando teclas ainda não vistas"""
+    entry = _KEY_TABLE.get(key)
+    if entry is None:
+        entry = (_KC_HIDDEN, '') if key.startswith('Key.') else (_KC_TEXT, key)
+        _KEY_TABLE[key] = entry
+    return entry
+
+
+@njit('(boolean[:], int64[:], float64[:], float64[:])', cache=True)
+def _command_runs(is_suspicious, ts, hold, flight):
+    """Percorre os eventos uma única vez agrupando os comandos suspeitos consecutivos.
+
+    Retorna o número de sequências e, para as sequências com mais de um evento,
+    a distância de Manhattan acumulada entre eventos vizinhos (tempo em segundos
+    + hold time + flight time, com valores ausentes tratados como zero).
+    """
+    n = is_suspicious.size
+    distances = np.empty(n // 2 + 1, dtype=np.float64)
+    sequences = 0
+    count = 0
+    i = 0
+    while i < n:
+        if not is_suspicious[i]:
+            i += 1
+            continue
+        
+        start = i
+        distance = 0.0
+        prev_hold = hold[i] if hold[i] == hold[i] else 0.0
+        prev_flight = flight[i] if flight[i] == flight[i] else 0.0
+        i += 1
+        while i < n and is_suspicious[i]:
+            cur_hold = hold[i] if hold[i] == hold[i] else 0.0
+            cur_flight = flight[i] if flight[i] == flight[i] else 0.0
+            distance += abs(ts[i] - ts[i - 1]) / 1000 + abs(cur_hold - prev_hold) + abs(cur_flight - prev_flight)
+            prev_hold = cur_hold
+            prev_flight = cur_flight
+            i += 1
+        
+        sequences += 1
+        if i - start > 1:
+            distances[count] = distance
+            count += 1
+    
+    return sequences, distances[:count]
+
+
+@njit('(int8[:], int64[:], float64[:], float64[:], float64, float64)', cache=True)
+def _segment_scan(key_class, ts, hold, flight, base_hold_time, base_flight_time):
+    """Percorre os eventos uma única vez e devolve os limites de cada trecho.
+
+    Para cada trecho retorna o tipo (_KC_TEXT para digitação ou a classe do
+    comando), o índice inicial, o índice final (exclusivo), o índice do último
+    evento de tecla e se a distância de Manhattan do trecho o torna suspeito.
+    """
+    n = key_class.size
+    kinds = np.empty(n, dtype=np.int8)
+    starts = np.empty(n, dtype=np.int64)
+    ends = np.empty(n, dtype=np.int64)
+    lasts = np.empty(n, dtype=np.int64)
+    suspicious = np.zeros(n, dtype=np.bool_)
+    threshold = (base_hold_time + base_flight_time) * 0.5
+
+    count = 0
+    last_was_ctrl = False
+    seg_start = -1
+    last_key = -1
+    visible = 0
+    hold_sum = 0.0
+    hold_count = 0
+    flight_sum = 0.0
+    flight_count = 0
+
+    for i in range(n):
+        kc = key_class[i]
+
+        if kc == _KC_MODIFIER:
+            last_was_ctrl = True
+            continue
+
+        is_command = last_was_ctrl and _KC_COPY <= kc <= _KC_CUT
+        last_was_ctrl = False
+
+        if not is_command and kc == _KC_NONE:
+            continue
+
+        if is_command or (last_key >= 0 and ts[i] - ts[last_key] > 2000):
+            if seg_start >= 0:
+                kinds[count] = _KC_TEXT
+                starts[count] = seg_start
+                ends[count] = i
+                lasts[count] = last_key
+                if visible >= 2 and hold_count > 0 and flight_count > 0:
+                    distance = abs(hold_sum / hold_count - base_hold_time) + abs(flight_sum / flight_count - base_flight_time)
+                    suspicious[count] = distance > threshold
+                count += 1
+                seg_start = -1
+                visible = 0
+                hold_sum = 0.0
+                hold_count = 0
+                flight_sum = 0.0
+                flight_count = 0
+
+        if is_command:
+            kinds[count] = kc
+            starts[count] = i
+            ends[count] = i + 1
+            lasts[count] = i
+            count += 1
+            continue
+
+        if kc != _KC_HIDDEN:
+            if seg_start < 0:
+                seg_start = i
+            visible += 1
+            if not np.isnan(hold[i]):
+                hold_sum += hold[i]
+                hold_count += 1
+            if not np.isnan(flight[i]):
+                flight_sum += flight[i]
+                flight_count += 1
+
+        last_key = i
+
+    if seg_start >= 0:
+        kinds[count] = _KC_TEXT
+        starts[count] = seg_start
+        ends[count] = n
+        lasts[count] = last_key
+        if visible >= 2 and hold_count > 0 and flight_count > 0:
+            distance = abs(hold_sum / hold_count - base_hold_time) + abs(flight_sum / flight_count - base_flight_time)
+            suspicious[count] = distance > threshold
+        count += 1
+
+    return kinds[:count], starts[:count], ends[:count], lasts[:count], suspicious[:count]
+
+
 class KeyloggerAnalyzer:
     def __init__(self, json_file):
         self.json_file = json_file
-        self.data = None
+        self._hold = None
+        self._flight = None
+        self._ts = None
+        self._cmd_type = None
+        self._is_suspicious = None
+        self._is_copy_paste = None
+        self._app_id = None
+        self._app_names = None
+        self._key_class = None
+        self._display = None
+        self._ts_text = None
         self.load_data()
         
     def load_data(self):
-        """Carrega os dados do arquivo JSON"""
+        """Carrega os dados do arquivo JSON (ou do cache .npz, se ainda válido)"""
+        cache_path = self.json_file + '.npz'
         try:
-            with open(self.json_file, 'r', encoding='utf-8') as f:
-                self.data = json.load(f)
-        except Exception as e:
+            stat = os.stat(self.json_file)
+        except OSError as e:
             print(f"Erro ao carregar o arquivo: {e}")
             sys.exit(1)
+        
+        # As análises usam apenas as colunas: a lista de eventos é descartada logo após a extração
+        if not self._load_cache(cache_path, stat):
+            try:
+                with open(self.json_file, 'rb') as f:
+                    events = _json_loads(f.read())
+            except Exception as e:
+                print(f"Erro ao carregar o arquivo: {e}")
+                sys.exit(1)
+            
+            self._build_columns(events)
+            del events
+            self._save_cache(cache_path, stat)
+        
+        # Máscaras de comando compartilhadas entre as análises
+        self._is_suspicious = self._cmd_type > 0
+        self._is_copy_paste = (self._cmd_type >= _CMD_CODES['paste']) & (self._cmd_type <= _CMD_CODES['cut'])
+
+    def _load_cache(self, cache_path, stat):
+        """Recarrega as colunas do cache .npz se ele corresponder à versão atual do JSON"""
+        try:
+            with np.load(cache_path, allow_pickle=False) as cache:
+                if (int(cache['version']) != _CACHE_VERSION
+                        or int(cache['mtime_ns']) != stat.st_mtime_ns
+                        or int(cache['size']) != stat.st_size):
+                    return False
+                self._hold = cache['hold']
+                self._flight = cache['flight']
+                self._ts = cache['ts']
+                self._cmd_type = cache['cmd_type']
+                self._app_id = cache['app_id']
+                self._app_names = cache['app_names'].tolist()
+                self._key_class = cache['key_class']
+                self._display = cache['display'].tolist()
+                self._ts_text = cache['ts_text'].tolist()
+        except Exception:
+            # Cache ausente, corrompido ou de outro formato: refaz a leitura do JSON
+            return False
+        return True
+
+    def _save_cache(self, cache_path, stat):
+        """Salva as colunas extraídas em um cache .npz ao lado do JSON"""
+        # Colunas de texto só vão para o cache se voltarem idênticas (None, números ou '\0' no fim
+        # seriam convertidos pelo numpy e o relatório mudaria conforme o cache existisse ou não)
+        text_columns = {}
+        for name, values in (('app_names', self._app_names), ('display', self._display), ('ts_text', self._ts_text)):
+            array = np.array(values, dtype=str)
+            if array.tolist() != values:
+                return
+            text_columns[name] = array
+        
+        tmp_path = cache_path + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.savez(f,
+                         version=_CACHE_VERSION,
+                         mtime_ns=stat.st_mtime_ns,
+                         size=stat.st_size,
+                         hold=self._hold,
+                         flight=self._flight,
+                         ts=self._ts,
+                         cmd_type=self._cmd_type,
+                         app_id=self._app_id,
+                         key_class=self._key_class,
+                         **text_columns)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # Diretório sem permissão de escrita: segue sem cache
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _build_columns(self, events):
+        """Extrai, em uma única passagem, as colunas numéricas usadas pelas análises"""
+        hold = []
+        flight = []
+        timestamps = []
+        cmd_type = []
+        app_id = []
+        key_class = []
+        display = []
+        app_ids = {}
+        key_entry = _key_entry
+        
+        for event in events:
+            value = event.get('hold_time')
+            hold.append(value if value is not None else np.nan)
+            value = event.get('flight_time')
+            flight.append(value if value is not None else np.nan)
+            timestamps.append(event['timestamp'])
+            cmd_type.append(_CMD_CODES.get(event.get('command_type'), 0))
+            app_id.append(app_ids.setdefault(event.get('application', 'Unknown'), len(app_ids)))
+            
+            key = event.get('key')
+            kc, text = key_entry(key) if key else (_KC_NONE, '')
+            key_class.append(kc)
+            display.append(text)
+        
+        self._hold = np.array(hold, dtype=np.float64)
+        self._flight = np.array(flight, dtype=np.float64)
+        # Timestamps em milissegundos desde a época, convertidos uma única vez
+        self._ts = np.array(timestamps, dtype='datetime64[ms]').astype(np.int64)
+        self._cmd_type = np.array(cmd_type, dtype=np.int8)
+        self._app_id = np.array(app_id, dtype=np.int32)
+        self._app_names = list(app_ids)
+        self._key_class = np.array(key_class, dtype=np.int8)
+        self._display = display
+        self._ts_text = timestamps
+    
+    @cached_property
+    def _hold_times(self):
+        """Hold times válidos (sem NaN), filtrados uma única vez"""
+        return self._hold[~np.isnan(self._hold)]
+    
+    @cached_property
+    def _flight_times(self):
+        """Flight times válidos (sem NaN), filtrados uma única vez"""
+        return self._flight[~np.isnan(self._flight)]
     
-    def calculate_typing_metrics(self):
-        """Calcula métricas de digitação"""
-        valid_events = [event for event in self.data if 'hold_time' in event and event['hold_time'] is not None]
+    @cached_property
+    def typing_metrics(self):
+        """Métricas de digitação (calculadas uma única vez por analisador)"""
+        hold_times = self._hold_times
+        total_events = hold_times.size
         
-        if not valid_events:
+        if not total_events:
             return {
                 "hold_time_avg": 0,
                 "hold_time_std": 0,
@@ -37,120 +401,79 @@ class KeyloggerAnalyzer:
                 "total_events": 0
             }
         
-        hold_times = [event['hold_time'] for event in valid_events if event['hold_time'] is not None]
-        flight_times = [event['flight_time'] for event in valid_events if event['flight_time'] is not None]
+        flight_times = self._flight[~np.isnan(self._hold) & ~np.isnan(self._flight)]
         
-        hold_time_avg = np.mean(hold_times) if hold_times else 0
-        hold_time_std = np.std(hold_times) if hold_times else 0
-        flight_time_avg = np.mean(flight_times) if flight_times else 0
-        flight_time_std = np.std(flight_times) if flight_times else 0
+        hold_time_avg, hold_time_std = _mean_std(hold_times)
+        flight_time_avg, flight_time_std = _mean_std(flight_times) if flight_times.size else (0, 0)
         
         return {
             "hold_time_avg": round(hold_time_avg, 3),
             "hold_time_std": round(hold_time_std, 3),
             "flight_time_avg": round(flight_time_avg, 3),
             "flight_time_std": round(flight_time_std, 3),
-            "total_events": len(valid_events)
+            "total_events": total_events
         }
     
-    def analyze_suspicious_commands(self):
-        """Analisa a frequência de comandos suspeitos e sua distância de Manhattan"""
-        suspicious_commands = ["paste", "copy", "cut", "backspace", "cursor_movement"]
-        
-        command_counts = Counter()
-        command_sequences = []
-        current_sequence = []
-        
-        for event in self.data:
-            if event.get('command_type') in suspicious_commands:
-                current_sequence.append(event)
-                command_counts[event['command_type']] += 1
-            elif current_sequence:
-                command_sequences.append(current_sequence)
-                current_sequence = []
-        
-        if current_sequence:
-            command_sequences.append(current_sequence)
-        
-        manhattan_distances = []
-        for sequence in command_sequences:
-            if len(sequence) > 1:
-                distance = self._calculate_sequence_manhattan(sequence)
-                manhattan_distances.append(distance)
-        
-        total_commands = sum(command_counts.values())
-        total_events = len(self.data)
+    @cached_property
+    def suspicious_commands(self):
+        """Frequência de comandos suspeitos e sua distância de Manhattan (calculadas uma única vez)"""
+        total_events = self._cmd_type.size
+        counts = np.bincount(self._cmd_type, minlength=len(_SUSPICIOUS_COMMANDS) + 1)
+        command_counts = {name: count for name, count in zip(_SUSPICIOUS_COMMANDS, counts[1:].tolist()) if count}
+        total_commands = int(counts[1:].sum())
+        
+        # Sequências = trechos maximais de eventos consecutivos com comando suspeito
+        command_sequences, manhattan_distances = _command_runs(self._is_suspicious, self._ts, self._hold, self._flight)
+        manhattan_distances = manhattan_distances.tolist()
+        
         suspicious_percentage = (total_commands / total_events * 100) if total_events > 0 else 0
         
         avg_manhattan = sum(manhattan_distances) / len(manhattan_distances) if manhattan_distances else 0
         
         return {
-            "command_counts": dict(command_counts),
+            "command_counts": command_counts,
             "suspicious_percentage": round(suspicious_percentage, 2),
             "total_commands": total_commands,
             "avg_manhattan_distance": round(avg_manhattan, 2),
-            "command_sequences": len(command_sequences)
+            "command_sequences": command_sequences
         }
     
-    def _calculate_sequence_manhattan(self, sequence):
-        """Calcula a distância de Manhattan para uma sequência de comandos"""
-        if len(sequence) < 2:
-            return 0.0
-
-        total_distance = 0.0
-        for i in range(len(sequence) - 1):
-            current = sequence[i]
-            next_event = sequence[i + 1]
-
-            try:
-                t1 = datetime.strptime(current['timestamp'], "%Y-%m-%d %H:%M:%S.%f")
-                t2 = datetime.strptime(next_event['timestamp'], "%Y-%m-%d %H:%M:%S.%f")
-            except Exception:
-                continue  # Pula se o timestamp for inválido
-
-            time_diff = abs((t2 - t1).total_seconds())
-            hold_diff = abs((next_event.get('hold_time') or 0) - (current.get('hold_time') or 0))
-            flight_diff = abs((next_event.get('flight_time') or 0) - (current.get('flight_time') or 0))
-
-            total_distance += time_diff + hold_diff + flight_diff
-
-        return total_distance
-
-    
-    def calculate_manhattan_distance(self):
-        """Calcula a distância de Manhattan para avaliar o padrão comportamental"""
-        app_events = {}
-        for event in self.data:
-            app = event.get('application', 'Unknown')
-            if app not in app_events:
-                app_events[app] = []
-            app_events[app].append(event)
+    @cached_property
+    def application_metrics(self):
+        """Métricas por aplicação para avaliar o padrão comportamental (calculadas uma única vez)"""
+        if not self._app_id.size:
+            return {}
+        
+        # Agrupa os eventos por aplicação preservando a ordem de aparição
+        order = np.argsort(self._app_id, kind='stable')
+        sorted_app = self._app_id[order]
+        starts = np.flatnonzero(np.concatenate(([True], sorted_app[1:] != sorted_app[:-1])))
+        ends = np.append(starts[1:], sorted_app.size)
+        
+        event_counts = ends - starts
+        durations = (self._ts[order[ends - 1]] - self._ts[order[starts]]) / 1000
+        suspicious_counts = np.add.reduceat(self._is_copy_paste[order].astype(np.int64), starts)
         
         app_metrics = {}
-        for app, events in app_events.items():
-            if len(events) >= 2:
-                start_time = datetime.strptime(events[0]['timestamp'], "%Y-%m-%d %H:%M:%S.%f")
-                end_time = datetime.strptime(events[-1]['timestamp'], "%Y-%m-%d %H:%M:%S.%f")
-                duration = (end_time - start_time).total_seconds()
-                
-                typing_rate = len(events) / duration if duration > 0 else 0
-                
-                suspicious_count = sum(1 for e in events if e.get('command_type') in ["paste", "copy", "cut"])
-                suspicious_ratio = suspicious_count / len(events) if len(events) > 0 else 0
+        for app, event_count, duration, suspicious_count in zip(sorted_app[starts].tolist(), event_counts.tolist(),
+                                                                durations.tolist(), suspicious_counts.tolist()):
+            if event_count >= 2:
+                typing_rate = event_count / duration if duration > 0 else 0
+                suspicious_ratio = suspicious_count / event_count
                 
-                app_metrics[app] = {
+                app_metrics[self._app_names[app]] = {
                     "duration": round(duration, 2),
                     "typing_rate": round(typing_rate, 2),
                     "suspicious_ratio": round(suspicious_ratio, 2),
-                    "event_count": len(events)
+                    "event_count": event_count
                 }
         
         return app_metrics
 
     def calculate_outlier_count(self, threshold=3.0):
         """Conta quantos tempos de digitação são outliers com base no Z-score"""
-        hold_times = np.array([event['hold_time'] for event in self.data if 'hold_time' in event and event['hold_time'] is not None])
-        flight_times = np.array([event['flight_time'] for event in self.data if 'flight_time' in event and event['flight_time'] is not None])
+        hold_times = self._hold_times
+        flight_times = self._flight_times
         
         outliers = {
             "hold_time_outliers": 0,
@@ -158,167 +481,61 @@ class KeyloggerAnalyzer:
         }
 
         if len(hold_times) > 1:
-            hold_z = zscore(hold_times)
-            outliers["hold_time_outliers"] = int(np.sum(np.abs(hold_z) > threshold))
+            outliers["hold_time_outliers"] = _zscore_outliers(hold_times, threshold)
 
         if len(flight_times) > 1:
-            flight_z = zscore(flight_times)
-            outliers["flight_time_outliers"] = int(np.sum(np.abs(flight_z) > threshold))
+            outliers["flight_time_outliers"] = _zscore_outliers(flight_times, threshold)
 
         return outliers
 
 
-    def _format_key(self, key):
-        """Formata a tecla para exibição legível"""
-        if isinstance(key, str) and not key.startswith('Key.'):
-            if key.lower() in ['c', 'v', 'x']:
-                return f'[{key.upper()}]'
-            return key
-        
-        if isinstance(key, str) and key.startswith('Key.'):
-            key = key[4:]
-            
-            special_keys = {
-                'space': ' ',
-                'enter': '  ↵  ',
-                'tab': '  →|  ',
-                'backspace': '  |←  ',
-                'delete': '  del  ',
-                'up': '  ↑  ',
-                'down': '  ↓  ',
-                'left': '  ←  ',
-                'right': '  →  ',
-                'shift': '',
-                'shift_r': '',
-                'shift_l': '',
-                'ctrl': '',
-                'ctrl_l': '',
-                'ctrl_r': '',
-                'alt': '',
-                'alt_l': '',
-                'alt_r': '',
-                'cmd': '',
-                'cmd_l': '',
-                'cmd_r': ''
-            }
-            return special_keys.get(key, '')
-        
-        return ''
-
+    @cached_property
+    def _segments(self):
+        """Limites dos trechos de texto e comandos (calculados uma única vez por analisador)"""
+        typing_metrics = self.typing_metrics
+        return _segment_scan(
+            self._key_class, self._ts, self._hold, self._flight,
+            float(typing_metrics['hold_time_avg']), float(typing_metrics['flight_time_avg']))
+    
+    def iter_text_segments(self):
+        """Gera, sob demanda, os trechos de texto e comandos para identificar padrões de digitação"""
+        kinds, starts, ends, lasts, suspicious = self._segments
+        
+        display = self._display
+        for kind, start, end, last, is_suspicious in zip(kinds.tolist(), starts.tolist(), ends.tolist(),
+                                                         lasts.tolist(), suspicious.tolist()):
+            if kind == _KC_TEXT:
+                yield {
+                    'type': 'typing',
+                    'text': ''.join(display[start:end]),
+                    'start_time': _ms_to_datetime(self._ts[start]),
+                    'end_time': _ms_to_datetime(self._ts[last]),
+                    'is_suspicious': is_suspicious
+                }
+            else:
+                yield {
+                    'type': 'command',
+                    'command': _COMMAND_NAMES[kind],
+                    'time': self._ts_text[start]
+                }
+    
     def analyze_text_segments(self):
         """Analisa os trechos de texto e comandos para identificar padrões de digitação"""
-        segments = []
-        current_segment = []
-        current_text = []
-        last_event_time = None
-        segment_start_time = None
-        last_was_ctrl = False
-        
-        typing_metrics = self.calculate_typing_metrics()
-        base_hold_time = typing_metrics['hold_time_avg']
-        base_flight_time = typing_metrics['flight_time_avg']
-        
-        segment_events = []
-        
-        for i, event in enumerate(self.data):
-            current_time = datetime.strptime(event['timestamp'], "%Y-%m-%d %H:%M:%S.%f")
-            
-            if event.get('key') in ['Key.ctrl', 'Key.ctrl_l', 'Key.ctrl_r', 'Key.cmd', 'Key.cmd_l', 'Key.cmd_r']:
-                last_was_ctrl = True
-                continue
-            
-            if last_was_ctrl and event.get('key') in ['c', 'v', 'x']:
-                if current_text:
-                    is_suspicious = self._analyze_segment_manhattan(segment_events, base_hold_time, base_flight_time)
-                    segments.append({
-                        'type': 'typing',
-                        'text': ''.join(current_text),
-                        'start_time': segment_start_time,
-                        'end_time': last_event_time,
-                        'is_suspicious': is_suspicious
-                    })
-                    current_text = []
-                    segment_events = []
-                
-                command_type = {'c': 'copy', 'v': 'paste', 'x': 'cut'}[event['key']]
-                segments.append({
-                    'type': 'command',
-                    'command': command_type,
-                    'time': event['timestamp']
-                })
-                
-                last_was_ctrl = False
-                continue
-            
-            last_was_ctrl = False
-            
-            if event.get('key'):
-                if not current_text:
-                    segment_start_time = current_time
-                
-                if last_event_time and (current_time - last_event_time).total_seconds() > 2.0:
-                    if current_text:
-                        is_suspicious = self._analyze_segment_manhattan(segment_events, base_hold_time, base_flight_time)
-                        segments.append({
-                            'type': 'typing',
-                            'text': ''.join(current_text),
-                            'start_time': segment_start_time,
-                            'end_time': last_event_time,
-                            'is_suspicious': is_suspicious
-                        })
-                        current_text = []
-                        segment_events = []
-                    segment_start_time = current_time
-                
-                formatted_key = self._format_key(event['key'])
-                if formatted_key:
-                    current_text.append(formatted_key)
-                    segment_events.append(event)
-                
-                last_event_time = current_time
-        
-        if current_text:
-            is_suspicious = self._analyze_segment_manhattan(segment_events, base_hold_time, base_flight_time)
-            segments.append({
-                'type': 'typing',
-                'text': ''.join(current_text),
-                'start_time': segment_start_time,
-                'end_time': last_event_time,
-                'is_suspicious': is_suspicious
-            })
-        
-        return segments
-
-    def _analyze_segment_manhattan(self, events, base_hold_time, base_flight_time):
-        """Analisa um segmento de texto usando distância de Manhattan para determinar se é suspeito"""
-        if len(events) < 2:
-            return False
-            
-        hold_times = [event['hold_time'] for event in events if 'hold_time' in event and event['hold_time'] is not None]
-        flight_times = [event['flight_time'] for event in events if 'flight_time' in event and event['flight_time'] is not None]
-        
-        if not hold_times or not flight_times:
-            return False
-            
-        segment_hold_avg = np.mean(hold_times)
-        segment_flight_avg = np.mean(flight_times)
-        
-        manhattan_distance = abs(segment_hold_avg - base_hold_time) + abs(segment_flight_avg - base_flight_time)
-        
-        threshold = (base_hold_time + base_flight_time) * 0.5
-        
-        return manhattan_distance > threshold
+        return list(self.iter_text_segments())
     
     def generate_report(self):
         """Gera um relatório completo da análise"""
-        typing_metrics = self.calculate_typing_metrics()
-        suspicious_analysis = self.analyze_suspicious_commands()
-        manhattan_metrics = self.calculate_manhattan_distance()
+        typing_metrics = self.typing_metrics
+        suspicious_analysis = self.suspicious_commands
+        manhattan_metrics = self.application_metrics
         text_segments = self.analyze_text_segments()
         outlier_counts = self.calculate_outlier_count()
 
-        total_typing_segments = sum(1 for seg in text_segments if seg["type"] == "typing")
-        suspicious_typing_segments = sum(1 for seg in text_segments if seg["type"] == "typing" and seg.get("is_suspicious"))
+        # Contagens tiradas direto do resultado do kernel, sem percorrer a lista de trechos
+        kinds, _, _, _, suspicious = self._segments
+        typing = kinds == _KC_TEXT
+        total_typing_segments = int(np.count_nonzero(typing))
+        suspicious_typing_segments = int(np.count_nonzero(typing & suspicious))
         suspicious_typing_ratio = (suspicious_typing_segments / total_typing_segments * 100) if total_typing_segments > 0 else 0
 
         is_suspicious = False
@@ -363,40 +580,18 @@ class KeyloggerAnalyzer:
         
         return report
     
-    def plot_typing_patterns(self):
-        """Gera gráfico de frequência de digitação ao longo do tempo"""
-        # Get timestamps and create time windows
-        timestamps = []
-        for event in self.data:
-            if 'timestamp' in event:
-                try:
-                    # Try to parse the timestamp
-                    if isinstance(event['timestamp'], str):
-                        # Try different timestamp formats
-                        try:
-                            ts = datetime.strptime(event['timestamp'], "%Y-%m-%d %H:%M:%S.%f")
-                        except ValueError:
-                            try:
-                                ts = datetime.strptime(event['timestamp'], "%Y-%m-%d %H:%M:%S")
-                            except ValueError:
-                                # If it's a Unix timestamp
-                                ts = datetime.fromtimestamp(float(event['timestamp']))
-                    else:
-                        # If it's already a number (Unix timestamp)
-                        ts = datetime.fromtimestamp(float(event['timestamp']))
-                    timestamps.append(ts.timestamp())
-                except (ValueError, TypeError):
-                    continue
-
-        if not timestamps:
+    def plot_typing_patterns(self, fig=None):
+        """Gera gráfico de frequência de digitação ao longo do tempo (reutiliza `fig` se informada)"""
+        if not len(self._ts):
             return None
-            
-        # Convert timestamps to datetime objects
-        start_time = datetime.fromtimestamp(min(timestamps))
-        end_time = datetime.fromtimestamp(max(timestamps))
+        
+        # Timestamps are already parsed into milliseconds since the epoch
+        timestamps = np.sort(self._ts)
+        start_ms = int(timestamps[0])
+        end_ms = int(timestamps[-1])
         
         # Calculate total duration in seconds
-        total_duration = (end_time - start_time).total_seconds()
+        total_duration = (end_ms - start_ms) / 1000
         
         # Determine window size based on total duration
         if total_duration <= 300:  # 5 minutes or less
@@ -408,38 +603,41 @@ class KeyloggerAnalyzer:
         else:
             window_size = 60  # 1 minute
         
-        # Create time windows
-        time_windows = []
-        current_time = start_time
-        while current_time <= end_time:
-            time_windows.append(current_time)
-            current_time += timedelta(seconds=window_size)
+        # Create time windows (edges from start_time up to end_time)
+        window_ms = window_size * 1000
+        edges = start_ms + window_ms * np.arange((end_ms - start_ms) // window_ms + 1)
+        time_windows = edges.astype('datetime64[ms]')
         
-        # Count events in each window
-        event_counts = []
-        for i in range(len(time_windows) - 1):
-            window_start = time_windows[i].timestamp()
-            window_end = time_windows[i + 1].timestamp()
-            count = sum(1 for ts in timestamps if window_start <= ts < window_end)
-            event_counts.append(count)
+        # Count events in each [start, end) window with a single binary search over the sorted timestamps
+        event_counts = np.diff(np.searchsorted(timestamps, edges, side='left')).tolist()
         
-        # Create the plot with improved styling
-        plt.figure(figsize=(15, 8))
+        plt = _pyplot()
+        import matplotlib.dates as mdates
+        from matplotlib.collections import LineCollection
+        
+        # Create the plot with improved styling (reusing the caller's figure when given)
+        owns_figure = fig is None
+        if owns_figure:
+            fig = plt.figure(figsize=(15, 8))
+        else:
+            fig.clf()
+        ax = fig.add_subplot()
         
         # Plot the line with gradient color based on frequency
-        points = plt.plot(time_windows[:-1], event_counts, marker='o', linestyle='-', markersize=4, alpha=0.7)
+        ax.plot(time_windows[:-1], event_counts, marker='o', linestyle='-', markersize=4, alpha=0.7)
         
         # Add color gradient based on frequency
         cmap = plt.cm.viridis
         norm = plt.Normalize(min(event_counts), max(event_counts))
-        for i in range(len(event_counts)-1):
-            plt.plot([time_windows[i], time_windows[i+1]], 
-                    [event_counts[i], event_counts[i+1]], 
-                    color=cmap(norm(event_counts[i])), 
-                    linewidth=2)
+        # Draw every gradient segment as a single LineCollection instead of one Line2D per window
+        x = mdates.date2num(time_windows[:-1])
+        y = np.asarray(event_counts, dtype=np.float64)
+        segments = np.stack((np.column_stack((x[:-1], y[:-1])), np.column_stack((x[1:], y[1:]))), axis=1)
+        ax.add_collection(LineCollection(segments, colors=cmap(norm(y[:-1])), linewidths=2,
+                                      capstyle='projecting'))
         
         # Add scatter points with color gradient
-        scatter = plt.scatter(time_windows[:-1], event_counts, 
+        scatter = ax.scatter(time_windows[:-1], event_counts, 
                             c=event_counts, 
                             cmap=cmap, 
                             norm=norm,
@@ -447,38 +645,44 @@ class KeyloggerAnalyzer:
                             alpha=0.6)
         
         # Add colorbar
-        plt.colorbar(scatter, label='Frequência de Digitação')
+        fig.colorbar(scatter, ax=ax, label='Frequência de Digitação')
         
         # Customize the plot
-        plt.title('Frequência de Digitação ao Longo do Tempo', pad=20, fontsize=14)
-        plt.xlabel('Tempo', labelpad=10, fontsize=12)
-        plt.ylabel('Número de Teclas Digitadas', labelpad=10, fontsize=12)
+        ax.set_title('Frequência de Digitação ao Longo do Tempo', pad=20, fontsize=14)
+        ax.set_xlabel('Tempo', labelpad=10, fontsize=12)
+        ax.set_ylabel('Número de Teclas Digitadas', labelpad=10, fontsize=12)
         
         # Format x-axis
-        plt.gcf().autofmt_xdate()  # Rotate and align the tick labels
-        plt.grid(True, linestyle='--', alpha=0.3)
+        fig.autofmt_xdate()  # Rotate and align the tick labels
+        ax.grid(True, linestyle='--', alpha=0.3)
         
         # Add some padding to the y-axis
-        plt.margins(y=0.1)
+        ax.margins(y=0.1)
         
         # Add window size information
         window_text = f"Janela de tempo: {window_size} segundos"
-        plt.figtext(0.02, 0.02, window_text, fontsize=10, style='italic')
+        fig.text(0.02, 0.02, window_text, fontsize=10, style='italic')
         
-        plt.tight_layout()
+        fig.tight_layout()
         
+        # The PNG is only an intermediate: ReportLab decodes it and recompresses the pixels into the PDF,
+        # so a fast zlib level saves encoding time without changing the final report
         buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.savefig(buf, format='png', dpi=100, bbox_inches='tight',
+                    pil_kwargs={'compress_level': 1})
+        if owns_figure:
+            plt.close(fig)
         buf.seek(0)
         return buf
 
-    def generate_pdf_report(self, report, output_file="analysis_report.pdf"):
+    def generate_pdf_report(self, report, output_file="analysis_report.pdf", fig=None):
         """Gera um relatório em PDF"""
-        graph_data = self.plot_typing_patterns()
-        report['graph_data'] = graph_data
+        # O ReportLab só é carregado quando um relatório é de fato gerado
+        from report_generator import ReportGenerator
         
-        generator = ReportGenerator(report, output_file)
+        graph_data = self.plot_typing_patterns(fig)
+        
+        generator = ReportGenerator(report, output_file, graph_data=graph_data)
         return generator.generate_pdf()
 
 def process_json_files(input_path, output_dir):
@@ -500,34 +704,70 @@ def process_json_files(input_path, output_dir):
             sys.exit(1)
     else:
         input_dir = input_path
-        all_files = os.listdir(input_dir)
-        json_files = [os.path.join(input_dir, f) for f in all_files 
-                     if f.endswith('.json') and os.path.isfile(os.path.join(input_dir, f))]
+        # DirEntry guarda o tipo do arquivo: evita um stat() extra por entrada
+        with os.scandir(input_dir) as entries:
+            json_files = [entry.path for entry in entries
+                          if entry.name.endswith('.json') and entry.is_file()]
     
     if not json_files:
         print(f"Nenhum arquivo JSON encontrado em: {input_path}")
         sys.exit(1)
     
-    for json_file_path in json_files:
-        try:
-            json_file_name = os.path.basename(json_file_path)
-            file_name_without_ext = os.path.splitext(json_file_name)[0]
-            
-            output_file = os.path.join(output_dir, f"{file_name_without_ext}_report.pdf")
-            
-            analyzer = KeyloggerAnalyzer(json_file_path)
-            report = analyzer.generate_report()
-            
-            analyzer.generate_pdf_report(report, output_file)
-                        
-            if report['is_suspicious']:
-                print("\nRazões para suspeita:")
-                for reason in report['suspicious_reasons']:
-                    print(f"- {reason}")
-            
-        except Exception as e:
-            print(f"Erro ao processar o arquivo {json_file_name}: {e}")
-            continue
+    # Os arquivos são independentes: com mais de um, cada um é analisado em um processo
+    worker = partial(_process_one, output_dir=output_dir)
+    max_workers = min(len(json_files), os.cpu_count() or 1)
+    if max_workers > 1:
+        # Maiores arquivos primeiro: evita que um arquivo grande no fim do lote deixe os outros processos ociosos
+        json_files.sort(key=os.path.getsize, reverse=True)
+        # Lotes de arquivos por tarefa reduzem a troca de mensagens quando há muitos arquivos pequenos
+        chunksize = max(1, len(json_files) // (4 * max_workers))
+        if chunksize > 1:
+            # O map entrega lotes contíguos: intercala a lista ordenada para que o lote k receba os
+            # arquivos k, k + n_lotes, ... e os maiores arquivos fiquem em lotes (e processos) diferentes
+            n_chunks = -(-len(json_files) // chunksize)
+            json_files = [path for k in range(n_chunks) for path in json_files[k::n_chunks]]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for message in executor.map(worker, json_files, chunksize=chunksize):
+                if message:
+                    print(message)
+    else:
+        for json_file_path in json_files:
+            message = worker(json_file_path)
+            if message:
+                print(message)
+
+_batch_figure = None
+
+def _get_batch_figure():
+    """Retorna a figura do matplotlib reaproveitada entre os arquivos do processo atual"""
+    global _batch_figure
+    if _batch_figure is None:
+        _batch_figure = _pyplot().figure(figsize=(15, 8))
+    return _batch_figure
+
+def _process_one(json_file_path, output_dir):
+    """Analisa um arquivo JSON, gera o relatório em PDF e retorna as mensagens para exibição"""
+    json_file_name = os.path.basename(json_file_path)
+    lines = []
+    try:
+        file_name_without_ext = os.path.splitext(json_file_name)[0]
+        
+        output_file = os.path.join(output_dir, f"{file_name_without_ext}_report.pdf")
+        
+        analyzer = KeyloggerAnalyzer(json_file_path)
+        report = analyzer.generate_report()
+        
+        analyzer.generate_pdf_report(report, output_file, _get_batch_figure())
+        
+        if report['is_suspicious']:
+            lines.append(f"\nRazões para suspeita ({json_file_name}):")
+            for reason in report['suspicious_reasons']:
+                lines.append(f"- {reason}")
+    
+    except Exception as e:
+        lines.append(f"Erro ao processar o arquivo {json_file_name}: {e}")
+    
+    return "\n".join(lines)
     
 def main():
     if len(sys.argv) < 2:
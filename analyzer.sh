@@ -25,7 +25,7 @@ if [ ! -d "$1" ]; then
     exit 1
 fi
 
-json_count=$(find "$1" -name "*.json" | wc -l)
+json_count=$(find "$1" -maxdepth 1 -name "*.json" | wc -l)
 
 if [ "$json_count" -eq 0 ]; then
     echo -e "${RED}Erro: Nenhum arquivo JSON encontrado no diretório '$1'${NC}"
@@ -33,9 +33,8 @@ if [ "$json_count" -eq 0 ]; then
 fi
 
 
-for json_file in "$1"/*.json; do
-    echo -e "\n${GREEN}Processando arquivo: $(basename "$json_file")${NC}"
-    python3 analyzer.py "$json_file"
-done
+# Um único processo Python analisa todos os arquivos em paralelo e informa o resultado de cada um
+echo -e "\n${GREEN}Processando diretório: $1 ($json_count arquivos)${NC}"
+python3 analyzer.py "$1"
 
 echo -e "\n${GREEN}Processo concluído! Todos os arquivos foram analisados.${NC}" 
\ No newline at end of file
@@ -4,112 +4,255 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, PageBreak
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfbase.pdfmetrics import stringWidth
+import copy
+import io
 import os
 from datetime import datetime
 
+# Comandos de estilo comuns às tabelas: cabeçalho, corpo e grade
+_HEADER_CMDS = [
+    ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.darkblue),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+]
+
+_BODY_CMDS = [
+    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 10),
+]
+
+_GRID_CMDS = [
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+]
+
+# Estilos de tabela compartilhados por todas as seções (montados uma única vez)
+_TABLE_STYLE = TableStyle(_HEADER_CMDS + _BODY_CMDS + _GRID_CMDS)
+
+# Tabela de trechos de texto: coluna de conteúdo maior e espaçamento uniforme nas células
+_TEXT_TABLE_STYLE = TableStyle(_HEADER_CMDS + _BODY_CMDS + [
+    ('FONTSIZE', (1, 1), (1, -1), 11),
+] + _GRID_CMDS + [
+    ('LEFTPADDING', (0, 0), (-1, -1), 6),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+    ('TOPPADDING', (0, 0), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+])
+
+def _build_styles():
+    """Monta a folha de estilos do relatório com os estilos personalizados"""
+    styles = getSampleStyleSheet()
+    
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        spaceAfter=30,
+        alignment=TA_CENTER
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='CustomHeading2',
+        parent=styles['Heading2'],
+        fontSize=16,
+        spaceAfter=12,
+        textColor=colors.darkblue
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='CustomBodyText',
+        parent=styles['Normal'],
+        fontSize=11,
+        spaceAfter=8
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='Alert',
+        parent=styles['Normal'],
+        fontSize=11,
+        textColor=colors.red,
+        spaceAfter=8
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='Conclusion',
+        parent=styles['Normal'],
+        fontSize=14,
+        textColor=colors.darkgreen,
+        spaceAfter=12
+    ))
+    
+    return styles
+
+# Folha de estilos compartilhada por todos os relatórios do processo (montada uma única vez)
+_STYLES = _build_styles()
+
+# Larguras das colunas das tabelas de métricas (duas colunas) e de aplicações
+_METRIC_COL_WIDTHS = [4*inch, 2*inch]
+_APP_COL_WIDTHS = [2*inch, 1*inch, 1.5*inch, 1.5*inch, 1*inch]
+
+# Colunas da tabela de trechos de texto; o conteúdo é texto simples quebrado na largura útil da célula
+_TEXT_COL_WIDTHS = [1.5*inch, 4*inch, 1.5*inch]
+_CONTENT_FONT = 'Helvetica'
+_CONTENT_FONT_SIZE = 11
+_CONTENT_WIDTH = _TEXT_COL_WIDTHS[1] - 12  # descontando LEFTPADDING e RIGHTPADDING
+_TEXT_HEADER = ["Tipo", "Conteúdo", "Tempo"]
+# Máximo de linhas por tabela: o ReportLab recalcula a tabela inteira a cada quebra de página
+_TEXT_TABLE_CHUNK = 100
+
+def _split_long_line(line):
+    """Quebra por caracteres uma linha sem espaços mais larga que a coluna (ex.: URLs)"""
+    pieces = []
+    start = 0
+    width = 0.0
+    for i, char in enumerate(line):
+        char_width = stringWidth(char, _CONTENT_FONT, _CONTENT_FONT_SIZE)
+        if width + char_width > _CONTENT_WIDTH and i > start:
+            pieces.append(line[start:i])
+            start = i
+            width = 0.0
+        width += char_width
+    pieces.append(line[start:])
+    return pieces
+
+def _wrap_content(text):
+    """Quebra o texto em linhas que cabem na coluna de conteúdo"""
+    if stringWidth(text, _CONTENT_FONT, _CONTENT_FONT_SIZE) <= _CONTENT_WIDTH:
+        return text
+    lines = []
+    # simpleSplit só quebra em espaços: palavras mais largas que a coluna são quebradas por caracteres,
+    # como fazia o splitLongWords dos Paragraphs
+    for line in simpleSplit(text, _CONTENT_FONT, _CONTENT_FONT_SIZE, _CONTENT_WIDTH):
+        if stringWidth(line, _CONTENT_FONT, _CONTENT_FONT_SIZE) <= _CONTENT_WIDTH:
+            lines.append(line)
+        else:
+            lines.extend(_split_long_line(line))
+    return '\n'.join(lines)
+
+def _hms(moment):
+    """Formata o horário como HH:MM:SS (equivalente a strftime('%H:%M:%S'), sem interpretar o formato)"""
+    return f"{moment.hour:02d}:{moment.minute:02d}:{moment.second:02d}"
+
+# Rótulos dos comandos na tabela de trechos de texto
+_COMMAND_LABELS = {
+    'copy': '[Ctrl+C] (Copiar)',
+    'paste': '[Ctrl+V] (Colar)',
+    'cut': '[Ctrl+X] (Recortar)'
+}
+
+# Textos fixos das explicações e da legenda (iguais em todos os relatórios)
+_MANHATTAN_NOTES = (
+    "• A Distância de Manhattan é uma métrica que mede a diferença absoluta entre dois pontos em um espaço n-dimensional",
+    "• No contexto da análise de digitação, ela é calculada como a soma das diferenças absolutas entre:",
+    "  - Tempo médio de pressionamento (hold time) do segmento vs. tempo base",
+    "  - Tempo médio entre teclas (flight time) do segmento vs. tempo base",
+    "• Um segmento é considerado suspeito quando sua distância de Manhattan excede um limiar determinado",
+    "• Isso ajuda a identificar padrões de digitação que se desviam significativamente do comportamento normal",
+)
+
+_ZSCORE_NOTES = (
+    "• O Z-score é uma medida estatística que indica quantos desvios padrão um valor está da média da distribuição",
+    "• É calculado como: Z = (X - μ) / σ, onde:",
+    "  - X é o valor observado",
+    "  - μ é a média da distribuição",
+    "  - σ é o desvio padrão da distribuição",
+    "• Valores com |Z-score| > 3 são considerados outliers, pois estão a mais de 3 desvios padrão da média",
+    "• Na análise de digitação, outliers podem indicar:",
+    "  - Pausas anormais entre teclas",
+    "  - Tempos de pressionamento inconsistentes",
+    "  - Possível uso de automação ou comportamento não humano",
+)
+
+_LEGEND_NOTES = (
+    "Legenda:",
+    "• Texto em preto: Digitação normal",
+    "• Texto em vermelho: Trechos suspeitos e comandos especiais",
+    "• Símbolos especiais:",
+    "  ↵ = Enter",
+    " |← = Backspace",
+    "  →| = Tab (tabulação)",
+    "  →  ←  ↓  ↑  = Movimento do cursor",
+    "Sequências de uso da tecla tab podem indicar uso do auto-complete das IDEs",
+)
+
+# Parágrafos de texto fixo já interpretados, por (texto, estilo)
+_PARAGRAPH_CACHE = {}
+
+def _static_paragraph(text, style):
+    """Retorna uma cópia de um parágrafo de texto fixo, interpretando o texto só na primeira vez"""
+    key = (text, style)
+    paragraph = _PARAGRAPH_CACHE.get(key)
+    if paragraph is None:
+        paragraph = _PARAGRAPH_CACHE[key] = Paragraph(text, _STYLES[style])
+    # Cópia rasa: compartilha os fragmentos já interpretados, mas o layout fica em cada cópia
+    return copy.copy(paragraph)
+
 class ReportGenerator:
-    def __init__(self, report_data, output_file="analysis_report.pdf"):
+    def __init__(self, report_data, output_file="analysis_report.pdf", graph_data=None):
         self.report_data = report_data
         self.output_file = output_file
-        self.styles = getSampleStyleSheet()
-        self._setup_styles()
-        
-    def _setup_styles(self):
-        """Configura estilos personalizados para o relatório"""
-        if 'CustomTitle' not in self.styles:
-            self.styles.add(ParagraphStyle(
-                name='CustomTitle',
-                parent=self.styles['Heading1'],
-                fontSize=24,
-                spaceAfter=30,
-                alignment=TA_CENTER
-            ))
-        
-        if 'CustomHeading2' not in self.styles:
-            self.styles.add(ParagraphStyle(
-                name='CustomHeading2',
-                parent=self.styles['Heading2'],
-                fontSize=16,
-                spaceAfter=12,
-                textColor=colors.darkblue
-            ))
-        
-        if 'CustomBodyText' not in self.styles:
-            self.styles.add(ParagraphStyle(
-                name='CustomBodyText',
-                parent=self.styles['Normal'],
-                fontSize=11,
-                spaceAfter=8
-            ))
-        
-        if 'Alert' not in self.styles:
-            self.styles.add(ParagraphStyle(
-                name='Alert',
-                parent=self.styles['Normal'],
-                fontSize=11,
-                textColor=colors.red,
-                spaceAfter=8
-            ))
-        
-        if 'Conclusion' not in self.styles:
-            self.styles.add(ParagraphStyle(
-                name='Conclusion',
-                parent=self.styles['Normal'],
-                fontSize=14,
-                textColor=colors.darkgreen,
-                spaceAfter=12
-            ))
+        # O gráfico (PNG em memória) fica fora do dicionário do relatório, que permanece serializável
+        self.graph_data = graph_data if graph_data is not None else report_data.get('graph_data')
+        self.styles = _STYLES
+        self.file_name = os.path.basename(report_data['file_analyzed'])
+    
+    def _append_paragraphs(self, story, texts, style='CustomBodyText'):
+        """Adiciona um parágrafo por texto fixo, todos com o mesmo estilo"""
+        story.extend(_static_paragraph(text, style) for text in texts)
+    
+    def _append_table(self, story, data, col_widths):
+        """Adiciona uma tabela no estilo padrão seguida do espaçamento da seção"""
+        table = Table(data, colWidths=col_widths)
+        table.setStyle(_TABLE_STYLE)
+        story.append(table)
+        story.append(Spacer(1, 0.2*inch))
+    
+    def _append_empty(self, story):
+        """Fecha uma seção sem dados com um aviso no lugar da tabela"""
+        story.append(_static_paragraph("Sem dados.", 'CustomBodyText'))
+        story.append(PageBreak())
     
     def _create_title_page(self, story):
         """Cria a página de título do relatório"""
-        story.append(Paragraph("RELATÓRIO DE ANÁLISE DE COMPORTAMENTO", self.styles['CustomTitle']))
-        story.append(Spacer(1, 0.5*inch))
-        
-        story.append(Paragraph("Identificação da Atividade", self.styles['CustomHeading2']))
-        story.append(Paragraph(f"Arquivo analisado: {os.path.basename(self.report_data['file_analyzed'])}", self.styles['CustomBodyText']))
-        story.append(Paragraph(f"Data da análise: {self.report_data['analysis_date']}", self.styles['CustomBodyText']))
-        story.append(Paragraph(f"Total de eventos registrados: {self.report_data['typing_metrics']['total_events']}", self.styles['CustomBodyText']))
-        
-        story.append(Spacer(1, 0.3*inch))
-        story.append(PageBreak())
+        body = self.styles['CustomBodyText']
+        # Os elementos da página de título entram na história de uma só vez; título e cabeçalho são fixos
+        story.extend((
+            _static_paragraph("RELATÓRIO DE ANÁLISE DE COMPORTAMENTO", 'CustomTitle'),
+            Spacer(1, 0.5*inch),
+            _static_paragraph("Identificação da Atividade", 'CustomHeading2'),
+            Paragraph(f"Arquivo analisado: {self.file_name}", body),
+            Paragraph(f"Data da análise: {self.report_data['analysis_date']}", body),
+            Paragraph(f"Total de eventos registrados: {self.report_data['typing_metrics']['total_events']}", body),
+            Spacer(1, 0.3*inch),
+            PageBreak(),
+        ))
     
     def _create_typing_metrics_section(self, story):
         """Cria a seção de métricas de digitação"""
         story.append(Paragraph("Métricas de Digitação", self.styles['CustomHeading2']))
+        metrics = self.report_data['typing_metrics']
         
         data = [
             ["Métrica", "Valor"],
-            ["Tempo médio de pressionamento", f"{self.report_data['typing_metrics']['hold_time_avg']} segundos"],
-            ["Desvio padrão do tempo de pressionamento", f"{self.report_data['typing_metrics']['hold_time_std']} segundos"],
-            ["Tempo médio entre teclas", f"{self.report_data['typing_metrics']['flight_time_avg']} segundos"],
-            ["Desvio padrão do tempo entre teclas", f"{self.report_data['typing_metrics']['flight_time_std']} segundos"]
+            ["Tempo médio de pressionamento", f"{metrics['hold_time_avg']} segundos"],
+            ["Desvio padrão do tempo de pressionamento", f"{metrics['hold_time_std']} segundos"],
+            ["Tempo médio entre teclas", f"{metrics['flight_time_avg']} segundos"],
+            ["Desvio padrão do tempo entre teclas", f"{metrics['flight_time_std']} segundos"]
         ]
         
-        table = Table(data, colWidths=[4*inch, 2*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.darkblue),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-        
-        story.append(table)
-        story.append(Spacer(1, 0.2*inch))
+        self._append_table(story, data, _METRIC_COL_WIDTHS)
         
-        if 'graph_data' in self.report_data:
+        if self.graph_data is not None:
             story.append(Paragraph("Distribuição de Tempos de Digitação", self.styles['CustomHeading2']))
-            img = Image(self.report_data['graph_data'], width=6*inch, height=4*inch)
+            img = Image(self.graph_data, width=6*inch, height=4*inch)
             story.append(img)
         
         story.append(PageBreak())
@@ -117,133 +260,70 @@ class ReportGenerator:
     def _create_suspicious_commands_section(self, story):
         """Cria a seção de análise de comandos suspeitos"""
         story.append(Paragraph("Análise de Comandos Suspeitos", self.styles['CustomHeading2']))
+        commands = self.report_data['suspicious_commands']
         
         data = [
-            ["Total de Comandos Suspeitos", f"{self.report_data['suspicious_commands']['total_commands']}/{self.report_data['typing_metrics']['total_events']}"],
-            ["Porcentagem", f"{self.report_data['suspicious_commands']['suspicious_percentage']}%"]
+            ["Total de Comandos Suspeitos", f"{commands['total_commands']}/{self.report_data['typing_metrics']['total_events']}"],
+            ["Porcentagem", f"{commands['suspicious_percentage']}%"]
         ]
         
-        table = Table(data, colWidths=[4*inch, 2*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.darkblue),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-        
-        story.append(table)
-        story.append(Spacer(1, 0.2*inch))
+        self._append_table(story, data, _METRIC_COL_WIDTHS)
         
         # Adiciona explicação sobre a Distância de Manhattan
         story.append(Paragraph("Sobre a Distância de Manhattan:", self.styles['CustomBodyText']))
-        story.append(Paragraph("• A Distância de Manhattan é uma métrica que mede a diferença absoluta entre dois pontos em um espaço n-dimensional", self.styles['CustomBodyText']))
-        story.append(Paragraph("• No contexto da análise de digitação, ela é calculada como a soma das diferenças absolutas entre:", self.styles['CustomBodyText']))
-        story.append(Paragraph("  - Tempo médio de pressionamento (hold time) do segmento vs. tempo base", self.styles['CustomBodyText']))
-        story.append(Paragraph("  - Tempo médio entre teclas (flight time) do segmento vs. tempo base", self.styles['CustomBodyText']))
-        story.append(Paragraph("• Um segmento é considerado suspeito quando sua distância de Manhattan excede um limiar determinado", self.styles['CustomBodyText']))
-        story.append(Paragraph("• Isso ajuda a identificar padrões de digitação que se desviam significativamente do comportamento normal", self.styles['CustomBodyText']))
+        self._append_paragraphs(story, _MANHATTAN_NOTES)
         
         story.append(PageBreak())
     
     def _create_outlier_analysis_section(self, story):
         """Cria a seção de análise de outliers"""
         story.append(Paragraph("Análise de Outliers (Z-score)", self.styles['CustomHeading2']))
+        outliers = self.report_data['outlier_counts']
         story.append(Paragraph("Esta seção mostra a análise de outliers baseada no Z-score para tempos de digitação.", self.styles['CustomBodyText']))
         story.append(Spacer(1, 0.2*inch))
         
         data = [
             ["Métrica", "Número de Outliers"],
-            ["Tempo de Pressionamento (Hold Time)", str(self.report_data['outlier_counts']['hold_time_outliers'])],
-            ["Tempo Entre Teclas (Flight Time)", str(self.report_data['outlier_counts']['flight_time_outliers'])]
+            ["Tempo de Pressionamento (Hold Time)", str(outliers['hold_time_outliers'])],
+            ["Tempo Entre Teclas (Flight Time)", str(outliers['flight_time_outliers'])]
         ]
         
-        table = Table(data, colWidths=[4*inch, 2*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.darkblue),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-        
-        story.append(table)
-        story.append(Spacer(1, 0.2*inch))
+        self._append_table(story, data, _METRIC_COL_WIDTHS)
         
         # Adiciona uma explicação detalhada sobre o Z-score
         story.append(Paragraph("Sobre o Z-score e a Detecção de Outliers:", self.styles['CustomBodyText']))
-        story.append(Paragraph("• O Z-score é uma medida estatística que indica quantos desvios padrão um valor está da média da distribuição", self.styles['CustomBodyText']))
-        story.append(Paragraph("• É calculado como: Z = (X - μ) / σ, onde:", self.styles['CustomBodyText']))
-        story.append(Paragraph("  - X é o valor observado", self.styles['CustomBodyText']))
-        story.append(Paragraph("  - μ é a média da distribuição", self.styles['CustomBodyText']))
-        story.append(Paragraph("  - σ é o desvio padrão da distribuição", self.styles['CustomBodyText']))
-        story.append(Paragraph("• Valores com |Z-score| > 3 são considerados outliers, pois estão a mais de 3 desvios padrão da média", self.styles['CustomBodyText']))
-        story.append(Paragraph("• Na análise de digitação, outliers podem indicar:", self.styles['CustomBodyText']))
-        story.append(Paragraph("  - Pausas anormais entre teclas", self.styles['CustomBodyText']))
-        story.append(Paragraph("  - Tempos de pressionamento inconsistentes", self.styles['CustomBodyText']))
-        story.append(Paragraph("  - Possível uso de automação ou comportamento não humano", self.styles['CustomBodyText']))
+        self._append_paragraphs(story, _ZSCORE_NOTES)
         
-        if self.report_data['outlier_counts']['hold_time_outliers'] > 5 or self.report_data['outlier_counts']['flight_time_outliers'] > 5:
+        if outliers['hold_time_outliers'] > 5 or outliers['flight_time_outliers'] > 5:
             story.append(Spacer(1, 0.2*inch))
             story.append(Paragraph("SINAIS DE ALERTA:", self.styles['Alert']))
-            story.append(Paragraph(f"• Número elevado de outliers detectados: {self.report_data['outlier_counts']['hold_time_outliers']} em hold time e {self.report_data['outlier_counts']['flight_time_outliers']} em flight time", self.styles['Alert']))
+            story.append(Paragraph(f"• Número elevado de outliers detectados: {outliers['hold_time_outliers']} em hold time e {outliers['flight_time_outliers']} em flight time", self.styles['Alert']))
         
         story.append(PageBreak())
     
     def _create_application_metrics_section(self, story):
         """Cria a seção de métricas por aplicação"""
         story.append(Paragraph("Métricas por Aplicação", self.styles['CustomHeading2']))
+        app_metrics = self.report_data['application_metrics']
+        if not app_metrics:
+            self._append_empty(story)
+            return
         
         data = [["Aplicação", "Duração (s)", "Taxa de Digitação", "Razão Suspeita", "Eventos"]]
-        
-        for app, metrics in self.report_data['application_metrics'].items():
-            data.append([
-                app,
-                str(metrics['duration']),
-                f"{metrics['typing_rate']:.2f}",
-                f"{metrics['suspicious_ratio']:.2f}",
-                str(metrics['event_count'])
-            ])
-        
-        table = Table(data, colWidths=[2*inch, 1*inch, 1.5*inch, 1.5*inch, 1*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.darkblue),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-        
-        story.append(table)
-        story.append(Spacer(1, 0.2*inch))
-        
-        if len(self.report_data['application_metrics']) > 5:
+        data.extend([
+            app,
+            str(metrics['duration']),
+            f"{metrics['typing_rate']:.2f}",
+            f"{metrics['suspicious_ratio']:.2f}",
+            str(metrics['event_count'])
+        ] for app, metrics in app_metrics.items())
+        
+        self._append_table(story, data, _APP_COL_WIDTHS)
+        
+        app_count = len(app_metrics)
+        if app_count > 5:
             story.append(Paragraph("SINAIS DE ALERTA:", self.styles['Alert']))
-            story.append(Paragraph(f"• Muitas aplicações diferentes utilizadas: {len(self.report_data['application_metrics'])}", self.styles['Alert']))
+            story.append(Paragraph(f"• Muitas aplicações diferentes utilizadas: {app_count}", self.styles['Alert']))
             story.append(Spacer(1, 0.1*inch))
         
         story.append(PageBreak())
@@ -251,83 +331,56 @@ class ReportGenerator:
     def _create_text_analysis_section(self, story):
         """Cria a seção de análise de trechos de texto"""
         story.append(Paragraph("Análise de Trechos de Texto", self.styles['CustomHeading2']))
+        segments = self.report_data['text_segments']
+        if not segments:
+            self._append_empty(story)
+            return
+        
         story.append(Paragraph("Esta seção mostra os trechos de texto digitados e os comandos utilizados.", self.styles['CustomBodyText']))
         story.append(Spacer(1, 0.2*inch))
         
-        self.styles.add(ParagraphStyle(
-            'NormalText',
-            parent=self.styles['CustomBodyText'],
-            textColor=colors.black
-        ))
-        self.styles.add(ParagraphStyle(
-            'RedText',
-            parent=self.styles['CustomBodyText'],
-            textColor=colors.red
-        ))
-        
-        data = [["Tipo", "Conteúdo", "Tempo"]]
+        rows = []
+        red = []
         
-        for segment in self.report_data['text_segments']:
+        for segment in segments:
             if segment['type'] == 'typing':
                 text = segment['text']
                 
                 if not text.strip():
                     text = '[espaço]'
                 
-                style = 'RedText' if segment['is_suspicious'] else 'NormalText'
-                content = Paragraph(text, self.styles[style])
-                
-                time_str = f"{segment['start_time'].strftime('%H:%M:%S')} - {segment['end_time'].strftime('%H:%M:%S')}"
-                data.append(["Digitação", content, time_str])
+                time_str = f"{_hms(segment['start_time'])} - {_hms(segment['end_time'])}"
+                rows.append(["Digitação", _wrap_content(text), time_str])
+                red.append(segment['is_suspicious'])
             else:
-                command_map = {
-                    'copy': '[Ctrl+C] (Copiar)',
-                    'paste': '[Ctrl+V] (Colar)',
-                    'cut': '[Ctrl+X] (Recortar)'
-                }
-                command_text = command_map.get(segment['command'], segment['command'].upper())
-                content = Paragraph(command_text, self.styles['RedText'])
-                data.append(["Comando", content, segment['time']])
-        
-        col_widths = [1.5*inch, 4*inch, 1.5*inch]
-        table = Table(data, colWidths=col_widths, rowHeights=[20] * len(data))
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.darkblue),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 6),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ]))
-        
-        story.append(table)
-        story.append(Spacer(1, 0.2*inch))
+                command_text = _COMMAND_LABELS.get(segment['command']) or segment['command'].upper()
+                rows.append(["Comando", command_text, segment['time']])
+                red.append(True)
+        
+        # Uma tabela por bloco de linhas, cada uma com seu cabeçalho, para que o custo de
+        # paginação cresça linearmente com o número de trechos
+        for start in range(0, len(rows), _TEXT_TABLE_CHUNK):
+            stop = start + _TEXT_TABLE_CHUNK
+            # Altura automática: trechos longos quebram linha sem invadir as linhas vizinhas;
+            # o cabeçalho se repete a cada página
+            table = Table([_TEXT_HEADER] + rows[start:stop], colWidths=_TEXT_COL_WIDTHS, repeatRows=1)
+            table.setStyle(_TEXT_TABLE_STYLE)
+            # Trechos suspeitos e comandos em vermelho, por faixa de linha em vez de um Paragraph por célula
+            table.setStyle(TableStyle([('TEXTCOLOR', (1, row), (1, row), colors.red)
+                                       for row, is_red in enumerate(red[start:stop], 1) if is_red]))
+            
+            story.append(table)
+            story.append(Spacer(1, 0.2*inch))
         
-        story.append(Paragraph("Legenda:", self.styles['CustomBodyText']))
-        story.append(Paragraph("• Texto em preto: Digitação normal", self.styles['CustomBodyText']))
-        story.append(Paragraph("• Texto em vermelho: Trechos suspeitos e comandos especiais", self.styles['CustomBodyText']))
-        story.append(Paragraph("• Símbolos especiais:", self.styles['CustomBodyText']))
-        story.append(Paragraph("  ↵ = Enter", self.styles['CustomBodyText']))
-        story.append(Paragraph(" |← = Backspace", self.styles['CustomBodyText']))
-        story.append(Paragraph("  →| = Tab (tabulação)", self.styles['CustomBodyText']))
-        story.append(Paragraph("  →  ←  ↓  ↑  = Movimento do cursor", self.styles['CustomBodyText']))
-        story.append(Paragraph("Sequências de uso da tecla tab podem indicar uso do auto-complete das IDEs", self.styles['CustomBodyText']))
+        self._append_paragraphs(story, _LEGEND_NOTES)
         story.append(PageBreak())
     
     def generate_pdf(self):
         """Gera o relatório em PDF"""
+        # O PDF é montado em memória e gravado no disco de uma só vez
+        buf = io.BytesIO()
         doc = SimpleDocTemplate(
-            self.output_file,
+            buf,
             pagesize=A4,
             rightMargin=72,
             leftMargin=72,
@@ -345,4 +398,6 @@ class ReportGenerator:
         self._create_text_analysis_section(story)
         
         doc.build(story)
+        with open(self.output_file, 'wb') as f:
+            f.write(buf.getbuffer())
         return self.output_file
\ No newline at end of file
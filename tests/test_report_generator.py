@@ -0,0 +1,37 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+import report_generator as rg
+
+
+def _width(line):
+    return stringWidth(line, rg._CONTENT_FONT, rg._CONTENT_FONT_SIZE)
+
+
+def test_texto_curto_nao_e_quebrado():
+    assert rg._wrap_content("print('ola')") == "print('ola')"
+
+
+def test_url_longa_e_quebrada_por_caracteres():
+    url = "https://exemplo.com.br/" + "caminho/muito/longo/sem/espacos/" * 4 + "index.html"
+    assert _width(url) > rg._CONTENT_WIDTH
+
+    lines = rg._wrap_content(url).split('\n')
+
+    assert len(lines) > 1
+    assert all(_width(line) <= rg._CONTENT_WIDTH for line in lines)
+    assert ''.join(lines) == url
+
+
+def test_identificador_longo_entre_palavras():
+    identifier = "nome_de_variavel_extremamente_longo_" * 4
+    text = f"valor = {identifier} + 1"
+
+    lines = rg._wrap_content(text).split('\n')
+
+    assert all(_width(line) <= rg._CONTENT_WIDTH for line in lines)
+    assert ''.join(lines).replace(' ', '') == text.replace(' ', '')